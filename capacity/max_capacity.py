@@ -2,8 +2,27 @@ import pandas as pd
 import numpy as np
 from datetime import datetime
 import seaborn as sns
+import matplotlib
+# Charts are only ever written to disk, so skip interactive (Tk/Qt) backend setup
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 
+# Set the style for all plots once at import rather than on every create_visualizations call
+sns.set()
+
+# PNG export settings: zlib level 3 instead of the default 6 and no Software
+# metadata chunk, which keeps chart writes cheap at a small file-size cost
+PNG_SAVE_KWARGS = {'pil_kwargs': {'compress_level': 3}, 'metadata': {'Software': None}}
+
+# Fixed subplot margins (left, right, top, bottom) for the charts whose layout does not
+# depend on the data. Setting these directly avoids the extra renderer pass
+# plt.tight_layout() makes to measure text. The pie charts are not listed: their labels
+# are placed from the data, so they are always laid out with tight_layout.
+CHART_MARGINS = {
+    'default': (0.1, 0.98, 0.93, 0.12),
+    'heatmap': (0.22, 0.98, 0.9, 0.18)
+}
+
 def calculate_max_capacity_events(raw_data_path, current_model_path, optimized_model_path):
     """
     Calculate when the ward reaches max capacity under both configurations.
@@ -26,10 +45,6 @@ def calculate_max_capacity_events(raw_data_path, current_model_path, optimized_m
     analysis_df = pd.merge(analysis_df, optimized_model, on='Date', suffixes=('', '_optimized'))
         
     def analyze_configuration(df, is_current_model=True):
-        max_capacity_days = []
-        turned_away_events = []
-        capacity_data = []
-        
         if is_current_model:
             # Current model: 13 double rooms (26 beds)
             total_rooms = 13
@@ -42,83 +57,81 @@ def calculate_max_capacity_events(raw_data_path, current_model_path, optimized_m
             double_rooms = 8
             single_rooms = 10
             max_beds = 26
+
+        # Every day is evaluated at once on whole columns
+        dates = df['Date'].to_numpy()
+        single_room_patients = df['Total Single Room Patients'].to_numpy()
+        double_room_patients = df['Double Room Patients'].to_numpy()
+        total_patients = df['Total Patients for Day'].to_numpy()
+
+        # Calculate available beds
+        if is_current_model:
+            # In current model:
+            # 1. Single room patients each need their own double room
+            rooms_for_single_patients = single_room_patients
             
-        for index, row in df.iterrows():
-            single_room_patients = row['Total Single Room Patients']
-            double_room_patients = row['Double Room Patients']
-            total_patients = row['Total Patients for Day']
+            # 2. Calculate how many double rooms are used by double room patients
+            # Use integer division to pair patients
+            paired_double_patients = (double_room_patients // 2) * 2
+            remaining_single_double_patients = double_room_patients % 2
             
-            # Calculate available beds
-            if is_current_model:
-                # In current model:
-                # 1. Single room patients each need their own double room
-                rooms_for_single_patients = single_room_patients
-                
-                # 2. Calculate how many double rooms are used by double room patients
-                # Use integer division to pair patients
-                paired_double_patients = (double_room_patients // 2) * 2
-                remaining_single_double_patients = double_room_patients % 2
-                
-                rooms_for_double_patients = paired_double_patients // 2
-                
-                # Calculate remaining capacity
-                rooms_used = rooms_for_single_patients + rooms_for_double_patients
-                rooms_available = total_rooms - rooms_used
-                
-                # Max capacity is reached if:
-                # 1. All rooms are fully occupied (no space for even a single patient)
-                # 2. Or we're at max total patients
-                # 3. Or we have one unpaired patient and no more rooms
-                is_max_capacity = (
-                    (rooms_available == 0 and remaining_single_double_patients == 0) or
-                    total_patients >= max_beds or
-                    (rooms_available == 0 and remaining_single_double_patients > 0)
-                )
-                
-                # Turn away occurs if we need more rooms than available
-                would_turn_away = rooms_used > total_rooms
-                                
-            else:
-                # Optimized model logic remains the same
-                single_rooms_used = min(single_room_patients, single_rooms)
-                remaining_single_patients = max(0, single_room_patients - single_rooms)
-                
-                double_rooms_for_isolation = remaining_single_patients
-                available_double_rooms = double_rooms - double_rooms_for_isolation
-                
-                paired_double_patients = (double_room_patients // 2) * 2
-                remaining_single_double_patients = double_room_patients % 2
-                
-                rooms_used = (
-                    single_rooms_used +
-                    double_rooms_for_isolation +
-                    (paired_double_patients // 2)
-                )
-                
-                rooms_available = total_rooms - rooms_used
-                
-                is_max_capacity = (
-                    total_patients >= max_beds or
-                    (rooms_available == 0 and remaining_single_double_patients > 0)
-                )
-                
-                would_turn_away = rooms_used > total_rooms
-
-            # Store detailed information for capacity events
-            if is_max_capacity or would_turn_away:
-                capacity_data.append({
-                    'Date': row['Date'],
-                    'Total_Patients': total_patients,
-                    'Single_Room_Patients': single_room_patients,
-                    'Double_Room_Patients': double_room_patients,
-                    'Is_Max_Capacity': is_max_capacity,
-                })
+            rooms_for_double_patients = paired_double_patients // 2
+            
+            # Calculate remaining capacity
+            rooms_used = rooms_for_single_patients + rooms_for_double_patients
+            rooms_available = total_rooms - rooms_used
+            
+            # Max capacity is reached if:
+            # 1. All rooms are fully occupied (no space for even a single patient)
+            # 2. Or we're at max total patients
+            # 3. Or we have one unpaired patient and no more rooms
+            is_max_capacity = (
+                ((rooms_available == 0) & (remaining_single_double_patients == 0)) |
+                (total_patients >= max_beds) |
+                ((rooms_available == 0) & (remaining_single_double_patients > 0))
+            )
+            
+            # Turn away occurs if we need more rooms than available
+            would_turn_away = rooms_used > total_rooms
+                            
+        else:
+            # Optimized model logic remains the same
+            single_rooms_used = np.minimum(single_room_patients, single_rooms)
+            remaining_single_patients = np.maximum(0, single_room_patients - single_rooms)
+            
+            double_rooms_for_isolation = remaining_single_patients
+            available_double_rooms = double_rooms - double_rooms_for_isolation
+            
+            paired_double_patients = (double_room_patients // 2) * 2
+            remaining_single_double_patients = double_room_patients % 2
+            
+            rooms_used = (
+                single_rooms_used +
+                double_rooms_for_isolation +
+                (paired_double_patients // 2)
+            )
+            
+            rooms_available = total_rooms - rooms_used
+            
+            is_max_capacity = (
+                (total_patients >= max_beds) |
+                ((rooms_available == 0) & (remaining_single_double_patients > 0))
+            )
             
-            if is_max_capacity:
-                max_capacity_days.append(row['Date'])
-                
-            if would_turn_away:
-                turned_away_events.append(row['Date'])
+            would_turn_away = rooms_used > total_rooms
+
+        # Store detailed information for capacity events
+        is_event = is_max_capacity | would_turn_away
+        capacity_data = {
+            'Date': dates[is_event].tolist(),
+            'Total_Patients': total_patients[is_event].tolist(),
+            'Single_Room_Patients': single_room_patients[is_event].tolist(),
+            'Double_Room_Patients': double_room_patients[is_event].tolist(),
+            'Is_Max_Capacity': is_max_capacity[is_event].tolist()
+        }
+
+        max_capacity_days = dates[is_max_capacity].tolist()
+        turned_away_events = dates[would_turn_away].tolist()
         
         return {
             'max_capacity_days': max_capacity_days,
@@ -174,10 +187,20 @@ def calculate_max_capacity_events(raw_data_path, current_model_path, optimized_m
     
     return results
 
-def create_visualizations(results):
-    # Set the style for all plots
-    sns.set()
+def apply_margins(fig, chart_type='default', precise_layout=False):
+    """Lay out fig with the CHART_MARGINS preset for chart_type, or with tight_layout if precise_layout is set or chart_type has no preset."""
+    if precise_layout or chart_type not in CHART_MARGINS:
+        fig.tight_layout()
+    else:
+        left, right, top, bottom = CHART_MARGINS[chart_type]
+        fig.subplots_adjust(left=left, right=right, top=top, bottom=bottom)
 
+def save_chart(fig, output_path):
+    """Save fig to output_path using PNG_SAVE_KWARGS and clear it for the next chart."""
+    fig.savefig(output_path, **PNG_SAVE_KWARGS)
+    fig.clear()
+
+def create_visualizations(results, precise_layout=False):
     # Create DataFrame for easier plotting
     data = pd.DataFrame({
         'Model': ['Current Model', 'Optimized Model'],
@@ -191,38 +214,41 @@ def create_visualizations(results):
         ]
     })
 
+    # A single figure is reused for every chart: it is cleared after each save
+    # and resized for the next one instead of building a new figure each time
+    fig = plt.figure(figsize=(10, 6))
+
     # 1. Bar Plot Comparison
-    plt.figure(figsize=(10, 6))
     sns.barplot(data=data, x='Model', y='Days at Max Capacity', palette='muted')
     plt.title('Days at Max Capacity by Model')
     plt.ylabel('Number of Days')
     plt.xticks(rotation=0)
-    plt.tight_layout()
-    plt.savefig('output/capacity_events_comparison.png')
-    plt.close()
+    apply_margins(fig, 'default', precise_layout)
+    save_chart(fig, 'output/capacity_events_comparison.png')
 
     # 2. Percentage Comparison
-    plt.figure(figsize=(8, 6))
-    sns.barplot(data=data, x='Model', y='Percent at Max Capacity', 
-                palette=['#ff7f0e', '#2ca02c'])
+    fig.set_size_inches(8, 6)
+    ax = sns.barplot(data=data, x='Model', y='Percent at Max Capacity', 
+                     palette=['#ff7f0e', '#2ca02c'])
     plt.title('Percent of Days at Max Capacity')
     plt.ylabel('Percentage')
     plt.xticks(rotation=0)
-    for i, v in enumerate(data['Percent at Max Capacity']):
-        plt.text(i, v + 1, f'{v:.1f}%', ha='center')
-    plt.tight_layout()
-    plt.savefig('output/capacity_percentages.png')
-    plt.close()
+    for bars in ax.containers:
+        ax.bar_label(bars, fmt='%.1f%%', padding=3)
+    apply_margins(fig, 'default', precise_layout)
+    save_chart(fig, 'output/capacity_percentages.png')
 
     # 3. Capacity Distribution (Pie Charts)
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 6))
+    fig.set_size_inches(12, 6)
+    ax1, ax2 = fig.subplots(1, 2)
+    pie_colors = sns.color_palette('pastel')
 
     # Current Model
     current_below = 100 - data.loc[0, 'Percent at Max Capacity']
     current_at = data.loc[0, 'Percent at Max Capacity']
     current_data = [current_below, current_at]
     ax1.pie(current_data, labels=['Below Capacity', 'At Max Capacity'], 
-            autopct='%1.1f%%', colors=sns.color_palette('pastel'))
+            autopct='%1.1f%%', colors=pie_colors)
     ax1.set_title('Current Model')
 
     # Optimized Model
@@ -230,23 +256,22 @@ def create_visualizations(results):
     optimized_at = data.loc[1, 'Percent at Max Capacity']
     optimized_data = [optimized_below, optimized_at]
     ax2.pie(optimized_data, labels=['Below Capacity', 'At Max Capacity'], 
-            autopct='%1.1f%%', colors=sns.color_palette('pastel'))
+            autopct='%1.1f%%', colors=pie_colors)
     ax2.set_title('Optimized Model')
 
     plt.suptitle('Capacity Distribution')
-    plt.tight_layout()
-    plt.savefig('output/capacity_distribution.png')
-    plt.close()
+    apply_margins(fig, 'pie', precise_layout)  # No preset: always tight_layout
+    save_chart(fig, 'output/capacity_distribution.png')
 
     # 4. Heatmap of Metrics
-    plt.figure(figsize=(10, 4))
+    fig.set_size_inches(10, 4)
     metrics_data = data.set_index('Model').T
     sns.heatmap(metrics_data, annot=True, fmt='.1f', cmap='YlOrRd', 
                 cbar_kws={'label': 'Value'})
     plt.title('Summary of Metrics')
-    plt.tight_layout()
-    plt.savefig('output/metrics_heatmap.png')
-    plt.close()
+    apply_margins(fig, 'heatmap', precise_layout)
+    save_chart(fig, 'output/metrics_heatmap.png')
+    plt.close(fig)
 
 if __name__ == "__main__":
     # Adjust these paths as needed
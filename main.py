@@ -1,5 +1,4 @@
 import os
-import pandas as pd
 from model_optimizer import OptimizedModelEvaluator
 from model_current import CurrentModelEvaluator
 from visualizer import Visualizer
@@ -21,9 +20,7 @@ def main():
     optimized_output_path = os.path.join(output_dir, 'optimized_model_data.csv')
     optimized_df.to_csv(optimized_output_path, index=False)
     
-    # Visualize the results
-    current_df = pd.read_csv('output/current_model_data.csv')
-    optimized_df = pd.read_csv('output/optimized_model_data.csv')
+    # Visualize the results straight from the frames just computed rather than re-reading the CSVs
     visualizer = Visualizer(current_df, optimized_df)
     
     visualizer.plot_wasted_beds_comparison(os.path.join(output_dir, 'wasted_beds_comparison.png'))
@@ -1,48 +1,42 @@
+import numpy as np
 import pandas as pd
+from data_loader import load_census_data
 
 class CurrentModelEvaluator:
     def __init__(self, data_path):
-        self.data = pd.read_csv(data_path)
+        self.data = load_census_data(data_path, usecols=['Single Room E', 'Total Single Room Patients', 'Closed Rooms'])
 
     def calculate_wasted_beds(self):
-        records = []
-
         # Consider only the most recent year(s) of data (2023 and 2024)
         self.data["Date"] = pd.to_datetime(self.data["Date"])
         self.data.dropna(subset=['Single Room E'], inplace=True)
         recent_year_data = self.data[self.data['Date'].dt.year.isin([2023, 2024])]
 
-        running_sum_available_beds = 0
-        running_sum_wasted_beds = 0
-        running_sum_wasted_potential = 0
-
-        for _, row in recent_year_data.iterrows():
-            date = pd.to_datetime(row['Date'])
-
-            available_beds = 26 - row['Closed Rooms']
-            wasted_beds = row['Total Single Room Patients'] # + row['Closed Rooms']
-            wasted_potential = 0  # No wasted potential in current model as all rooms are double
-
-            running_sum_available_beds += available_beds
-            running_sum_wasted_beds += wasted_beds
-            running_sum_wasted_potential += wasted_potential
-
-            daily_efficiency = (available_beds - wasted_beds - wasted_potential) / available_beds if available_beds > 0 else 0
-            cumulative_efficiency = (running_sum_available_beds - running_sum_wasted_beds - running_sum_wasted_potential) / running_sum_available_beds if running_sum_available_beds > 0 else 0
-
-            records.append({
-                "Date": date.date(),
-                "Available Beds": available_beds,
-                "Wasted Beds": wasted_beds,
-                "Wasted Potential": wasted_potential,
-                "Daily Efficiency": daily_efficiency,
-                "Cumulative Available Beds": running_sum_available_beds,
-                "Cumulative Wasted Beds": running_sum_wasted_beds,
-                "Cumulative Wasted Potential": running_sum_wasted_potential,
-                "Cumulative Efficiency": cumulative_efficiency
-            })
-
-        return pd.DataFrame(records)
+        # Every daily column is computed for all days at once
+        available_beds = 26 - recent_year_data['Closed Rooms'].to_numpy()
+        wasted_beds = recent_year_data['Total Single Room Patients'].to_numpy() # + Closed Rooms
+        wasted_potential = 0  # No wasted potential in current model as all rooms are double
+
+        daily_used = available_beds - wasted_beds - wasted_potential
+        daily_efficiency = np.divide(daily_used, available_beds, out=np.zeros_like(daily_used), where=available_beds > 0)
+
+        df = pd.DataFrame({
+            "Date": recent_year_data['Date'].dt.date.to_numpy(),
+            "Available Beds": available_beds,
+            "Wasted Beds": wasted_beds,
+            "Wasted Potential": wasted_potential,
+            "Daily Efficiency": daily_efficiency
+        })
+
+        # Running totals are cumulative sums of the daily columns, computed in one vectorised pass
+        df["Cumulative Available Beds"] = df["Available Beds"].cumsum()
+        df["Cumulative Wasted Beds"] = df["Wasted Beds"].cumsum()
+        df["Cumulative Wasted Potential"] = df["Wasted Potential"].cumsum()
+        cumulative_available = df["Cumulative Available Beds"].to_numpy(dtype=float)
+        cumulative_used = cumulative_available - df["Cumulative Wasted Beds"].to_numpy(dtype=float) - df["Cumulative Wasted Potential"].to_numpy(dtype=float)
+        df["Cumulative Efficiency"] = np.divide(cumulative_used, cumulative_available, out=np.zeros_like(cumulative_used), where=cumulative_available > 0)
+
+        return df
 
 # Usage
 if __name__ == "__main__":
@@ -1,6 +1,7 @@
 import pulp
 import pandas as pd
 import logging
+from data_loader import load_census_data
 
 # Set up logging to a file
 logging.basicConfig(filename='optimizer_debug.log', level=logging.DEBUG, 
@@ -8,7 +9,7 @@ logging.basicConfig(filename='optimizer_debug.log', level=logging.DEBUG,
 
 class WardOptimizer:
     def __init__(self, data_path):
-        self.data = pd.read_csv(data_path)
+        self.data = load_census_data(data_path, usecols=['Single Room E', 'Total Single Room Patients', 'Double Room Patients'])
         
     def optimize_space(self, log_path=None):
         # Define the problem
@@ -33,9 +34,14 @@ class WardOptimizer:
         self.data.dropna(subset=['Single Room E'], inplace=True)
         recent_year_data = self.data[self.data['Date'].dt.year.isin([2023, 2024])]
 
-        for i, row in recent_year_data.iterrows():
-            single_rooms_needed = row['Total Single Room Patients']
-            double_rooms_needed = row['Double Room Patients']
+        # Pull the per-day columns out of pandas once and walk them as plain arrays
+        day_columns = zip(
+            recent_year_data.index,
+            recent_year_data['Date'],  # Kept as a Series so the debug log still shows Timestamps
+            recent_year_data['Total Single Room Patients'].to_numpy(),
+            recent_year_data['Double Room Patients'].to_numpy()
+        )
+        for i, date, single_rooms_needed, double_rooms_needed in day_columns:
 
             # Variables to capture specific daily inefficiencies
             single_in_double_var = pulp.LpVariable(f'single_in_double_{i}', lowBound=0, cat='Integer')
@@ -57,7 +63,7 @@ class WardOptimizer:
             problem += total_wasted_potential >= pulp.lpSum(double_in_single), f"TotalWastedPotential_{i}"
 
             # Logging: Log intermediate variables
-            logging.debug(f"Date: {row['Date']}")
+            logging.debug(f"Date: {date}")
             logging.debug(f"Single Rooms Needed: {single_rooms_needed}, Double Rooms Needed: {double_rooms_needed}")
             logging.debug(f"Single in Double: {single_in_double_var.varValue}, Double in Single: {double_in_single_var.varValue}")
 
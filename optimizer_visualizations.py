@@ -2,6 +2,7 @@ import pandas as pd
 import numpy as np
 import seaborn as sns
 import matplotlib.pyplot as plt
+from data_loader import load_census_data
 
 sns.set()
 
@@ -10,10 +11,7 @@ sns.set()
 # Load the historical data
 data_paths = ['data/final_census_data_test_set.csv', 'data/final_census_data.csv', 'data/final_census_data_test_set_may_to_oct2024.csv']
 
-data = pd.DataFrame()
-
-for data_path in data_paths:
-    data = pd.concat([data, pd.read_csv(data_path)], ignore_index=True)
+data = pd.concat([load_census_data(data_path) for data_path in data_paths], ignore_index=True)
 
 # Consider only the most recent years (2023 and 2024)
 data["Date"] = pd.to_datetime(data["Date"])
@@ -24,89 +22,81 @@ recent_year_data = data[data['Date'].dt.year.isin([2023, 2024])]
 single_rooms = np.arange(0, 27)
 double_rooms = np.arange(0, 14)
 
-# Initialize matrices to store the objective function values, singles in double, and doubles in single
-objective_values = np.full((len(single_rooms), len(double_rooms)), np.nan)
-total_singles_in_double_values = np.full((len(single_rooms), len(double_rooms)), np.nan)
-total_doubles_in_single_values = np.full((len(single_rooms), len(double_rooms)), np.nan)
-
-# Iterate through each configuration and calculate the objective function and inefficiencies
-for i, S in enumerate(single_rooms):
-    for j, D in enumerate(double_rooms):
-        if 2 * D + S == 26:  # Feasibility condition
-            total_waste = 0
-            total_singles_in_double = 0
-            total_doubles_in_single = 0
+# Pull the daily patient counts out of pandas once
+single_patients = recent_year_data['Total Single Room Patients'].to_numpy()
+double_patients = recent_year_data['Double Room Patients'].to_numpy()
 
-            for _, row in recent_year_data.iterrows():
-                single_room_patients = row['Total Single Room Patients']
-                double_room_patients = row['Double Room Patients']
+# Only the configurations with 2D + S == 26 are feasible, so enumerate those pairs directly
+# (in ascending S order, i.e. row-major over the grid) instead of evaluating the whole grid
+S_grid, D_grid = np.meshgrid(single_rooms, double_rooms, indexing='ij')
+feasible = 2 * D_grid + S_grid == 26  # Feasibility condition
+feasible_S, feasible_D = S_grid[feasible], D_grid[feasible]
 
-                # Wasted beds in double rooms by single patients
-                wasted_single_in_double = max(0, single_room_patients - S)
+# Broadcast each feasible pair against every day: axis 0 = configuration, axis 1 = days
+# Wasted beds in double rooms by single patients, summed over all days
+total_singles_in_double_space = np.maximum(0, single_patients - feasible_S[:, None]).sum(axis=1)
 
-                # Wasted potential double room space when double patients are too many
-                wasted_double_in_single = max(0, double_room_patients - 2 * D)
+# Wasted potential double room space when double patients are too many, summed over all days
+total_doubles_in_single_space = np.maximum(0, double_patients - 2 * feasible_D[:, None]).sum(axis=1)
 
-                # Total wasted single patients in double rooms
-                total_singles_in_double += wasted_single_in_double
+# Total waste = wasted single in double + wasted double in single
+wasted_beds_space = total_singles_in_double_space + total_doubles_in_single_space
 
-                # Total wasted double patients in single rooms
-                total_doubles_in_single += wasted_double_in_single
-
-                # Total waste = wasted single in double + wasted double in single
-                total_waste += wasted_single_in_double + wasted_double_in_single
-
-            # Store the total wasted beds, singles in double, and doubles in single
-            objective_values[i, j] = total_waste
-            total_singles_in_double_values[i, j] = total_singles_in_double
-            total_doubles_in_single_values[i, j] = total_doubles_in_single
+# Scatter into the full grid for the heatmap; infeasible cells stay NaN
+objective_values = np.full((len(single_rooms), len(double_rooms)), np.nan)
+objective_values[feasible] = wasted_beds_space
 
 # Create a heatmap for the total wasted beds
+# Hand seaborn a contiguous float32 grid and its NaN mask so it can skip its own copy and NaN scan
+heatmap_values = np.ascontiguousarray(objective_values, dtype=np.float32)
 plt.figure(figsize=(10, 8))
-sns.heatmap(objective_values, annot=True, fmt=".0f", cmap="YlGnBu", xticklabels=double_rooms, yticklabels=single_rooms)
+ax = sns.heatmap(heatmap_values, mask=np.isnan(heatmap_values), annot=True, fmt=".0f", cmap="YlGnBu", xticklabels=double_rooms, yticklabels=single_rooms)
+ax.collections[0].set_rasterized(True)  # Emit the cells as one raster block in vector outputs
 plt.title("Objective Function Heatmap\n(Minimize Total Incorrectly Assigned Patients)")
 plt.xlabel("Number of Double Rooms (D)")
 plt.ylabel("Number of Single Rooms (S)")
 plt.savefig('output/optimizer_heatmap_test_set.png')
+plt.close()
 
-# Extract configurations for single/double rooms and wasted beds
-configurations = [(S, D) for S in single_rooms for D in double_rooms if 2 * D + S == 26]
-wasted_beds_space = [objective_values[i, j] for i, S in enumerate(single_rooms) for j, D in enumerate(double_rooms) if 2 * D + S == 26]
-total_singles_in_double_space = [total_singles_in_double_values[i, j] for i, S in enumerate(single_rooms) for j, D in enumerate(double_rooms) if 2 * D + S == 26]
-total_doubles_in_single_space = [total_doubles_in_single_values[i, j] for i, S in enumerate(single_rooms) for j, D in enumerate(double_rooms) if 2 * D + S == 26]
+# Configurations for single/double rooms, in the same order as the per-configuration totals above
+configurations = list(zip(feasible_S, feasible_D))
+config_labels = [f"S: {S}, D: {D}" for S, D in configurations]
 
 # Create a bar chart for wasted beds
 plt.figure(figsize=(12, 10))
-plt.bar([f"S: {S}, D: {D}" for S, D in configurations], wasted_beds_space, color='skyblue')
+plt.bar(config_labels, wasted_beds_space, color='skyblue')
 plt.xticks(rotation=45, ha='right')
 plt.xlabel("Room Configurations (Single Rooms, Double Rooms)")
 plt.ylabel("Inefficiency (Wasted Beds + Wasted Potential)")
 plt.title("Inefficiency vs. Room Configurations")
 plt.savefig('output/optimizer_bar_chart_test_set.png')
+plt.close()
 
 # Calculate efficiency for each configuration
 total_available_beds = len(recent_year_data) * 26
-efficiency = [(total_available_beds - wb) / total_available_beds for wb in wasted_beds_space]
+efficiency = (total_available_beds - wasted_beds_space) / total_available_beds
 
 # Create a line plot for efficiency
 plt.figure(figsize=(12, 10))
-plt.plot([f"S: {S}, D: {D}" for S, D in configurations], efficiency, marker='o', color='orange')
+plt.plot(config_labels, efficiency, marker='o', color='orange')
 plt.xticks(rotation=45, ha='right')
 plt.xlabel("Room Configurations (Single Rooms, Double Rooms)")
 plt.ylabel("Efficiency")
 plt.title("Efficiency vs. Room Configurations")
 plt.savefig('output/optimizer_efficiency_plot_test_set.png')
+plt.close()
 
 # Create line plots for total singles in double and total doubles in single as a function of room configurations
 plt.figure(figsize=(12, 10))
-plt.plot([f"S: {S}, D: {D}" for S, D in configurations], total_singles_in_double_space, marker='o', label='Singles in Double', color='blue')
-plt.plot([f"S: {S}, D: {D}" for S, D in configurations], total_doubles_in_single_space, marker='o', label='Doubles in Single', color='red')
+plt.plot(config_labels, total_singles_in_double_space, marker='o', label='Singles in Double', color='blue')
+plt.plot(config_labels, total_doubles_in_single_space, marker='o', label='Doubles in Single', color='red')
 plt.xticks(rotation=45, ha='right')
 plt.xlabel("Room Configurations (Single Rooms, Double Rooms)")
 plt.ylabel("Total Incorrectly Assigned Patients")
 plt.title("Wasted Singles in Double Rooms and Doubles in Single Rooms\nvs. Room Configurations")
 plt.legend()
 plt.savefig('output/wasted_patients_plot_test_set.png')
+plt.close()
 
 
 # Evan wants a CSV of the wasted beds and wasted potential for each room configuration
@@ -114,7 +104,7 @@ plt.savefig('output/wasted_patients_plot_test_set.png')
 print(total_singles_in_double_space)
 print(wasted_beds_space)
 data = {
-    "Room Configurations": [f"S: {S}, D: {D}" for S, D in configurations],
+    "Room Configurations": config_labels,
     "Wasted Beds": total_singles_in_double_space,
     "Wasted Potential": total_doubles_in_single_space
 }
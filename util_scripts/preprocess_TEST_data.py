@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 
 def process_sheet(df):
@@ -27,9 +28,11 @@ def process_sheet(df):
     df['Total Single Room Patients'] = df['Single Room E'] + df['Single Room F']
 
     # If Total Single Rooms (held beds) > Total Census Rooms, set Total Single Rooms to Total Census Rooms, 
-    df['Total Single Room Patients'] = df[['Total Single Room Patients', 'Total Census Rooms']].min(axis=1)
+    # fmin works element-wise without building a two-column frame, and like min(axis=1) ignores a missing value
+    census_rooms = df['Total Census Rooms'].to_numpy(dtype=float)
+    df['Total Single Room Patients'] = np.fmin(df['Total Single Room Patients'].to_numpy(), census_rooms)
 
-    df['Double Room Patients'] = df['Total Census Rooms'].astype(float) - df['Total Single Room Patients']
+    df['Double Room Patients'] = census_rooms - df['Total Single Room Patients'].to_numpy()
     df['Total Patients for Day'] = df['Total Single Room Patients'] + df['Double Room Patients']
 
     # Generate exact date based on the sheet_name (Month) and year
@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 
 def process_sheet(df, sheet_name: str, year: str):
@@ -32,14 +33,19 @@ def process_sheet(df, sheet_name: str, year: str):
     df['Total Single Room Patients'] = df['Single Room E'] + df['Single Room F']
 
     # If Total Single Rooms (held beds) > Total Census Rooms, set Total Single Rooms to Total Census Rooms, 
-    df['Total Single Room Patients'] = df[['Total Single Room Patients', 'Total Census Rooms']].min(axis=1)
+    # fmin works element-wise without building a two-column frame, and like min(axis=1) ignores a missing value
+    census_rooms = df['Total Census Rooms'].to_numpy(dtype=float)
+    df['Total Single Room Patients'] = np.fmin(df['Total Single Room Patients'].to_numpy(), census_rooms)
 
-    df['Double Room Patients'] = df['Total Census Rooms'].astype(float) - df['Total Single Room Patients']
+    df['Double Room Patients'] = census_rooms - df['Total Single Room Patients'].to_numpy()
     df['Total Patients for Day'] = df['Total Single Room Patients'] + df['Double Room Patients']
 
     # Generate exact date based on the sheet_name (Month) and year
+    # Rows are consecutive days, so build the dates as one range instead of parsing a string per row
+    month_start = pd.to_datetime(f'1-{sheet_name}-{year}', format='%d-%b-%Y')
+    df = df.iloc[:month_start.days_in_month]  # Rows past the end of the month have no date
     df['Day'] = df.index + 1  # Assuming the first row corresponds to the 1st of the month
-    df['Date'] = pd.to_datetime(df['Day'].astype(str) + '-' + sheet_name + '-' + year, format='%d-%b-%Y')
+    df['Date'] = pd.date_range(start=month_start, periods=len(df), freq='D')
 
     # Select final columns
     df = df[
@@ -59,11 +65,12 @@ def process_workbooks(file_paths):
         # example file path: Monthly Census 2022.xlsx
         year = file_path.split(' ')[-1].split('.')[0]
         xls = pd.ExcelFile(file_path)
-        for sheet_name in xls.sheet_names:
-            if len(sheet_name) == 3:
-                df = pd.read_excel(xls, sheet_name=sheet_name, skiprows=4)
-                processed_df = process_sheet(df, sheet_name, year)
-                all_data_frames.append(processed_df)
+        # Read every month sheet (3-letter names; the chart/graph sheets are skipped) in one call
+        month_sheets = [sheet_name for sheet_name in xls.sheet_names if len(sheet_name) == 3]
+        sheets = pd.read_excel(xls, sheet_name=month_sheets, skiprows=4)
+        for sheet_name, df in sheets.items():
+            processed_df = process_sheet(df, sheet_name, year)
+            all_data_frames.append(processed_df)
 
     # Concatenate all dataframes
     final_df = pd.concat(all_data_frames, ignore_index=True)
@@ -1,91 +1,337 @@
+import os
+import io
+import logging
+import multiprocessing
+import hashlib
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
 import pandas as pd
+import matplotlib
+# Plots are written to disk (possibly from worker processes), so use the non-interactive Agg backend
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
+import matplotlib.dates as mdates
+from matplotlib.backends.backend_pdf import PdfPages
 import seaborn as sns
 
 # Set Seaborn style
 sns.set(style="darkgrid", context="talk", palette="colorblind")
 
+# Looked up once here rather than in every plot
+PALETTE = tuple(sns.color_palette("colorblind"))
+
+# Path settings for drawing and saving the comparison plots: simplify at matplotlib's default
+# threshold and let Agg draw long paths in chunks. Applied with plt.rc_context, so other plots
+# in the importing process keep their own rcParams.
+COMPARISON_RC = {'path.simplify': True, 'path.simplify_threshold': 1 / 9, 'agg.path.chunksize': 10000}
+
+# Columns drawn by the comparison plots
+PLOT_COLUMNS = ('Wasted Beds', 'Wasted Potential', 'Daily Efficiency', 'Cumulative Efficiency')
+
+# Column -> indices into PALETTE for the (current, optimized) lines
+COMPARISON_COLORS = {
+    'Wasted Beds': (0, 2),
+    'Wasted Potential': (1, 3),
+    'Daily Efficiency': (0, 2),
+    'Cumulative Efficiency': (0, 2)
+}
+
+# Comparison plots are wide time series, so they do not need a square canvas. The fixed bottom
+# margin leaves room for the rotated date labels and the axis label on the shorter figure.
+FIGURE_SIZE = (14, 7)
+FIGURE_MARGINS = {'bottom': 0.18}
+
+# Fast zlib level: these flat line plots compress nearly as well at level 1 and encode several times faster
+PNG_SAVE_KWARGS = {'dpi': 100, 'pil_kwargs': {'compress_level': 1}}
+
+# Output file name (without extension) -> column it compares
+COMPARISON_PLOTS = {
+    'wasted_beds_comparison': 'Wasted Beds',
+    'wasted_potential_comparison': 'Wasted Potential',
+    'daily_efficiency_comparison': 'Daily Efficiency',
+    'cumulative_efficiency_comparison': 'Cumulative Efficiency'
+}
+
+# Above this many points per line, per-point markers are dropped; they dominate Agg draw time on dense series
+MARKER_POINT_LIMIT = 500
+
+def lttb_indices(values, threshold):
+    """
+    Pick at most threshold points of a series with Largest-Triangle-Three-Buckets.
+
+    Points are taken to be evenly spaced along x (one row per day), so their
+    positions stand in for x. The first and last points are always kept; each
+    bucket in between keeps the point forming the largest triangle with the
+    previously kept point and the average of the next bucket, which preserves
+    the peaks and troughs a plain stride would skip.
+
+    Returns:
+    ndarray: Sorted indices of the points to keep
+    """
+    n = len(values)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    y = np.asarray(values, dtype=float)
+    # Bucket boundaries for the n - 2 interior points split into threshold - 2 buckets
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    indices = np.empty(threshold, dtype=int)
+    indices[0], indices[-1] = 0, n - 1
+
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_start, next_end = (edges[bucket + 1], edges[bucket + 2]) if bucket + 2 < len(edges) else (n - 1, n)
+        next_x = (next_start + next_end - 1) / 2
+        next_y = y[next_start:next_end].mean()
+
+        candidates = np.arange(start, end)
+        areas = np.abs((previous - next_x) * (y[start:end] - y[previous]) - (previous - candidates) * (next_y - y[previous]))
+        previous = start + int(np.argmax(areas))
+        indices[bucket + 1] = previous
+
+    return indices
+
+def _plot_file_paths(plot_path):
+    # The plot path as a str plus the temporary file and '.hash' sidecar that go with it;
+    # shared by _plot_comparison and _safe_render so the two always agree on these names
+    plot_path = os.fspath(plot_path)
+    return plot_path, plot_path + '.tmp', os.path.splitext(plot_path)[0] + '.hash'
+
 class Visualizer:
     def __init__(self, current_data, optimized_data):
         self.current_data = current_data
         self.optimized_data = optimized_data
-    def plot_wasted_beds_comparison(self, plot_path):
-        plt.figure(figsize=(14, 14))
-        plt.plot(self.current_data['Date'], self.current_data['Wasted Beds'], label='Current Model Wasted Beds', marker='o', linestyle='-', linewidth=1, markersize=4, color=sns.color_palette("colorblind")[0])
-        plt.plot(self.optimized_data['Date'], self.optimized_data['Wasted Beds'], label='Optimized Model Wasted Beds', marker='x', linestyle='--', linewidth=1, markersize=4, color=sns.color_palette("colorblind")[2])
-        plt.xlabel('Date')
-        plt.ylabel('Wasted Beds')
-        plt.title('Comparison of Wasted Beds: Current Model vs Optimized Model')
-        plt.legend(loc='upper left')  # Legend moved to the top left
-        plt.grid(True)
-        
-        # Improve date label readability
-        plt.xticks(rotation=45)
-        plt.gca().xaxis.set_major_locator(plt.MaxNLocator(nbins=10))  # Show fewer date labels
 
-        plt.savefig(plot_path)
-        plt.show()
+        # Hand matplotlib plain NumPy arrays so it skips its per-call pandas Series conversion.
+        # float32 is far more precision than a pixel needs and halves the bytes moved while plotting.
+        self._x_current = self._date_array(self.current_data['Date'])
+        self._x_optimized = self._date_array(self.optimized_data['Date'])
+        self._y_current = {column: self.current_data[column].to_numpy(dtype=np.float32) for column in PLOT_COLUMNS if column in self.current_data}
+        self._y_optimized = {column: self.optimized_data[column].to_numpy(dtype=np.float32) for column in PLOT_COLUMNS if column in self.optimized_data}
+        self._show_markers = max(len(self._x_current), len(self._x_optimized)) <= MARKER_POINT_LIMIT
 
-    def plot_wasted_potential_comparison(self, plot_path):
-        plt.figure(figsize=(14, 14))
-        plt.plot(self.current_data['Date'], self.current_data['Wasted Potential'], label='Current Model Wasted Potential', marker='o', linestyle='-', linewidth=1, markersize=4, color=sns.color_palette("colorblind")[1])
-        plt.plot(self.optimized_data['Date'], self.optimized_data['Wasted Potential'], label='Optimized Model Wasted Potential', marker='x', linestyle='--', linewidth=1, markersize=4, color=sns.color_palette("colorblind")[3])
-        plt.xlabel('Date')
-        plt.ylabel('Wasted Potential')
-        plt.title('Comparison of Wasted Potential: Current Model vs Optimized Model')
-        plt.legend(loc='upper left')  # Legend moved to the top left
-        plt.grid(True)
+        # Shared by every plot; each figure is saved before the next one claims the locator and formatter
+        self._date_locator = mdates.AutoDateLocator(minticks=4, maxticks=10)
+        self._date_formatter = mdates.ConciseDateFormatter(self._date_locator)
 
-        # Improve date label readability
-        plt.xticks(rotation=45)
-        plt.gca().xaxis.set_major_locator(plt.MaxNLocator(nbins=10))  # Show fewer date labels
+    @staticmethod
+    def _date_array(dates):
+        # Parse once (only if needed) into datetime64 so matplotlib gets a real date axis, not string categories
+        if not pd.api.types.is_datetime64_any_dtype(dates):
+            dates = pd.to_datetime(dates)
+        return dates.to_numpy(dtype='datetime64[ns]')
 
-        plt.savefig(plot_path)
-        plt.show()
+    def _apply_dates(self, ax):
+        ax.xaxis.set_major_locator(self._date_locator)
+        ax.xaxis.set_major_formatter(self._date_formatter)
 
-    def plot_daily_efficiency_comparison(self, plot_path):
-        plt.figure(figsize=(14, 14))
-        plt.plot(self.current_data['Date'], self.current_data['Daily Efficiency'], label='Current Model Daily Efficiency', marker='o', linestyle='-', linewidth=1, markersize=4, color=sns.color_palette("colorblind")[0])
-        plt.plot(self.optimized_data['Date'], self.optimized_data['Daily Efficiency'], label='Optimized Model Daily Efficiency', marker='x', linestyle='--', linewidth=1, markersize=4, color=sns.color_palette("colorblind")[2])
-        plt.xlabel('Date')
-        plt.ylabel('Daily Efficiency')
-        plt.title('Comparison of Daily Efficiency: Current Model vs Optimized Model')
-        plt.legend(loc='upper left')  # Legend moved to the top left
-        plt.grid(True)
+    @staticmethod
+    def _downsample(x, y, max_points):
+        # Series longer than the figure can resolve are reduced with LTTB before drawing
+        if len(y) <= max_points:
+            return x, y
+        keep = lttb_indices(y, max_points)
+        return x[keep], y[keep]
+
+    def _draw_comparison(self, ax, column):
+        # Keep about two points per horizontal pixel
+        max_points = int(2 * ax.figure.get_figwidth() * ax.figure.dpi)
+        x_current, y_current = self._downsample(self._x_current, self._y_current[column], max_points)
+        x_optimized, y_optimized = self._downsample(self._x_optimized, self._y_optimized[column], max_points)
+
+        # Shared line settings are resolved once and reused for both series
+        current_color, optimized_color = COMPARISON_COLORS[column]
+        current_marker, optimized_marker = ('o', 'x') if self._show_markers else (None, None)
+        # Rasterize the data lines so PDF output embeds one bitmap layer instead of per-point vector paths;
+        # axes and text stay vector. PNG output is unaffected.
+        line_settings = {'linewidth': 1, 'markersize': 4, 'rasterized': True}
+
+        ax.plot(x_current, y_current, label=f'Current Model {column}', marker=current_marker, linestyle='-', color=PALETTE[current_color], **line_settings)
+        ax.plot(x_optimized, y_optimized, label=f'Optimized Model {column}', marker=optimized_marker, linestyle='--', color=PALETTE[optimized_color], **line_settings)
+        ax.set_xlabel('Date')
+        ax.set_ylabel(column)
+        ax.set_title(f'Comparison of {column}: Current Model vs Optimized Model')
+        ax.legend(loc='upper left')
+        ax.grid(True)
 
         # Improve date label readability
-        plt.xticks(rotation=45)
-        plt.gca().xaxis.set_major_locator(plt.MaxNLocator(nbins=10))  # Show fewer date labels
+        ax.tick_params(axis='x', labelrotation=45)
+        self._apply_dates(ax)  # Show fewer, shorter date labels
 
-        plt.savefig(plot_path)
-        plt.show()
+    def plot_all_comparisons_pdf(self, output_path):
+        """
+        Write every comparison as one page of a single PDF.
+
+        All pages are drawn on one figure that is cleared between metrics, so the
+        figure, renderer and font setup are paid once rather than once per chart.
+        Metrics whose column is missing from either frame are skipped with a warning.
+        """
+        fig, ax = plt.subplots(figsize=FIGURE_SIZE, gridspec_kw=FIGURE_MARGINS)
+        with PdfPages(output_path) as pdf, plt.rc_context(COMPARISON_RC):
+            for column in PLOT_COLUMNS:
+                if column not in self._y_current or column not in self._y_optimized:
+                    logging.warning(f"Skipping {column} page: column '{column}' is missing")
+                    continue
+                ax.clear()
+                self._draw_comparison(ax, column)
+                pdf.savefig(fig)
+        plt.close(fig)
+        return output_path
+
+    def _comparison_digest(self, column):
+        # Fingerprint of everything a comparison plot is drawn from
+        digest = hashlib.blake2b(column.encode(), digest_size=16)
+        for values in (self._x_current, self._y_current[column], self._x_optimized, self._y_optimized[column]):
+            digest.update(np.ascontiguousarray(values).tobytes())
+        return digest.hexdigest()
+
+    def _plot_comparison(self, column, plot_path, skip_unchanged=False, ax=None):
+        # With skip_unchanged, a '.hash' file next to the plot records the inputs it was drawn from,
+        # and the render is skipped when the plot exists and those inputs have not changed.
+        # A caller rendering several plots can pass its own axes, which is cleared and reused.
+        plot_path, temp_path, digest_path = _plot_file_paths(plot_path)  # Accepts any path-like, as savefig does
+        if skip_unchanged:
+            digest = self._comparison_digest(column)
+            if os.path.exists(plot_path) and os.path.exists(digest_path):
+                with open(digest_path) as f:
+                    if f.read() == digest:
+                        return plot_path
+
+        if ax is None:
+            fig, ax = plt.subplots(figsize=FIGURE_SIZE, gridspec_kw=FIGURE_MARGINS)
+            owns_figure = True
+        else:
+            fig = ax.figure
+            ax.clear()
+            owns_figure = False
+        buffer = io.BytesIO()
+        plot_format = os.path.splitext(plot_path)[1].lstrip('.').lower() or None
+        try:
+            with plt.rc_context(COMPARISON_RC):
+                self._draw_comparison(ax, column)
+                fig.savefig(buffer, format=plot_format, **(PNG_SAVE_KWARGS if plot_format in (None, 'png') else {}))
+        finally:
+            # Close a figure this call created even if drawing failed
+            if owns_figure:
+                plt.close(fig)
+
+        # Write to a temporary file and swap it in so a failed run never leaves a truncated plot behind
+        with open(temp_path, 'wb') as f:
+            f.write(buffer.getbuffer())
+        os.replace(temp_path, plot_path)
+
+        if skip_unchanged:
+            with open(digest_path, 'w') as f:
+                f.write(digest)
+        elif os.path.exists(digest_path):
+            # The plot no longer matches the recorded inputs
+            os.remove(digest_path)
+        return plot_path
+
+    def plot_wasted_beds_comparison(self, plot_path):
+        self._plot_comparison('Wasted Beds', plot_path)
+
+    def plot_wasted_potential_comparison(self, plot_path):
+        self._plot_comparison('Wasted Potential', plot_path)
+
+    def plot_daily_efficiency_comparison(self, plot_path):
+        self._plot_comparison('Daily Efficiency', plot_path)
 
     def plot_cumulative_efficiency_comparison(self, plot_path):
-        plt.figure(figsize=(14, 14))
-        plt.plot(self.current_data['Date'], self.current_data['Cumulative Efficiency'], label='Current Model Cumulative Efficiency', marker='o', linestyle='-', linewidth=1, markersize=4, color=sns.color_palette("colorblind")[0])
-        plt.plot(self.optimized_data['Date'], self.optimized_data['Cumulative Efficiency'], label='Optimized Model Cumulative Efficiency', marker='x', linestyle='--', linewidth=1, markersize=4, color=sns.color_palette("colorblind")[2])
-        plt.xlabel('Date')
-        plt.ylabel('Cumulative Efficiency')
-        plt.title('Comparison of Cumulative Efficiency: Current Model vs Optimized Model')
-        plt.legend(loc='upper left')  # Legend moved to the top left
-        plt.grid(True)
+        self._plot_comparison('Cumulative Efficiency', plot_path)
 
-        # Improve date label readability
-        plt.xticks(rotation=45)
-        plt.gca().xaxis.set_major_locator(plt.MaxNLocator(nbins=10))  # Show fewer date labels
+# Set in each worker process by _init_worker
+_worker_visualizer = None
+
+def _init_worker(current_data, optimized_data):
+    # Runs once per worker process: build the Visualizer that all of its plots are drawn from
+    global _worker_visualizer
+    _worker_visualizer = Visualizer(current_data, optimized_data)
+
+def _render_plot(column, plot_path, skip_unchanged):
+    # Runs in a worker process: render a single plot
+    return _worker_visualizer._plot_comparison(column, plot_path, skip_unchanged)
+
+def _safe_render(name, plot_path, render):
+    # Run one plot's render; on failure log the traceback and return None instead of raising.
+    # The plot itself is only ever swapped in whole, so a previous good PNG is kept; only the
+    # temporary file and the '.hash' sidecar are removed, so the sidecar can never vouch for it.
+    try:
+        return render()
+    except Exception:
+        logging.exception(f"Rendering {name} plot failed")
+        _, temp_path, digest_path = _plot_file_paths(plot_path)
+        for path in (temp_path, digest_path):
+            if os.path.exists(path):
+                os.remove(path)
+        return None
+
+def plot_all_comparisons(current_data, optimized_data, output_dir, max_workers=None, skip_unchanged=False):
+    """
+    Render every plot in COMPARISON_PLOTS into output_dir.
+
+    The plots are independent and CPU-bound in Agg rasterization, so they are
+    spread over a process pool; with a single worker they are drawn in-process.
 
-        plt.savefig(plot_path)
-        plt.show()
+    Parameters:
+    current_data: Current model results DataFrame
+    optimized_data: Optimized model results DataFrame
+    output_dir: Directory the PNGs are written to
+    max_workers: Process count (defaults to one per plot, capped at the CPU count)
+    skip_unchanged: Skip plots whose '.hash' sidecar shows their inputs are unchanged
+
+    Returns:
+    dict: Plot name -> path of the saved PNG (plots that are missing a column or fail to render are left out)
+    """
+    # Check columns up front so a plot that cannot be drawn never costs a figure or a worker
+    plot_paths = {}
+    for name, column in COMPARISON_PLOTS.items():
+        if column not in current_data.columns or column not in optimized_data.columns:
+            logging.warning(f"Skipping {name} plot: column '{column}' is missing")
+            continue
+        plot_paths[name] = os.path.join(output_dir, f'{name}.png')
+    if not plot_paths:
+        return plot_paths
+
+    if max_workers is None:
+        max_workers = min(len(plot_paths), os.cpu_count() or 1)
+
+    if max_workers <= 1:
+        # One figure is created up front and cleared between plots instead of rebuilt for each
+        visualizer = Visualizer(current_data, optimized_data)
+        fig, ax = plt.subplots(figsize=FIGURE_SIZE, gridspec_kw=FIGURE_MARGINS)
+        saved = {}
+        for name, plot_path in plot_paths.items():
+            render = partial(visualizer._plot_comparison, COMPARISON_PLOTS[name], plot_path, skip_unchanged, ax=ax)
+            if _safe_render(name, plot_path, render):
+                saved[name] = plot_path
+        plt.close(fig)
+        return saved
+
+    # Workers get the frames once, through the initializer, instead of with every plot. Forked workers
+    # inherit them from this process without any pickling; elsewhere they are pickled once per worker.
+    mp_context = multiprocessing.get_context('fork') if 'fork' in multiprocessing.get_all_start_methods() else None
+    saved = {}
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=mp_context, initializer=_init_worker, initargs=(current_data, optimized_data)) as executor:
+        futures = {
+            executor.submit(_render_plot, COMPARISON_PLOTS[name], plot_path, skip_unchanged): name
+            for name, plot_path in plot_paths.items()
+        }
+        for future in as_completed(futures):
+            name = futures[future]
+            if _safe_render(name, plot_paths[name], future.result):
+                saved[name] = plot_paths[name]
+
+    # Keep the COMPARISON_PLOTS order regardless of completion order
+    return {name: saved[name] for name in plot_paths if name in saved}
 
 # Usage
 if __name__ == "__main__":
-    current_df = pd.read_csv('output/current_model_data.csv')
-    optimized_df = pd.read_csv('output/optimized_model_data.csv')
-
-    visualizer = Visualizer(current_df, optimized_df)
+    # Parse Date while reading so the plots get datetime64 without a separate conversion pass
+    current_df = pd.read_csv('output/current_model_data.csv', parse_dates=['Date'])
+    optimized_df = pd.read_csv('output/optimized_model_data.csv', parse_dates=['Date'])
 
     # Generate the plots
-    visualizer.plot_wasted_beds_comparison('output/wasted_beds_comparison.png')
-    visualizer.plot_wasted_potential_comparison('output/wasted_potential_comparison.png')
-    visualizer.plot_daily_efficiency_comparison('output/daily_efficiency_comparison.png')
-    visualizer.plot_cumulative_efficiency_comparison('output/cumulative_efficiency_comparison.png')
+    plot_all_comparisons(current_df, optimized_df, 'output')